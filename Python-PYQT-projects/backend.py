@@ -1,8 +1,12 @@
+import hashlib
+import hmac
 import logging
+import secrets
 import sys
 from datetime import datetime, timedelta
-from collections import deque, defaultdict
+from collections import deque
 import difflib
+import heapq
 
 # ======= Helper functions for nicer menus =======
 def display_auth_menu():
@@ -49,6 +53,9 @@ class ReservationError(Exception):
 
 # ========== Domain Classes ==========
 class Book:
+    __slots__ = ("title", "author", "isbn", "genre", "total_copies", "available_copies",
+                 "avail_total", "_title_lc", "_author_lc", "_bigrams")
+
     def __init__(self, title: str, author: str, isbn: str, genre: str, total_copies: int = 1):
         self.title = title
         self.author = author
@@ -56,61 +63,179 @@ class Book:
         self.genre = genre
         self.total_copies = total_copies
         self.available_copies = total_copies
+        self.update_avail_total()
+        # normalized once here so searches never lowercase per query
+        self._title_lc = title.lower()
+        self._author_lc = author.lower()
+        self._bigrams = frozenset(zip(self._title_lc, self._title_lc[1:]))
+
+    def update_avail_total(self):
+        """Refresh the cached "available/total" label after a copy-count change."""
+        self.avail_total = f"{self.available_copies}/{self.total_copies}"
 
     def __repr__(self):
         return (f"{self.title} by {self.author} "
-                f"(ISBN: {self.isbn}) - {self.available_copies}/{self.total_copies} available")
+                f"(ISBN: {self.isbn}) - {self.avail_total} available")
 
 class eBook(Book):
+    __slots__ = ("download_size_mb",)
+
     def __init__(self, title: str, author: str, isbn: str, genre: str, download_size_mb: float):
         super().__init__(title, author, isbn, genre, total_copies=1)
         self.download_size_mb = download_size_mb
 
 # ========== Library Classes ==========
+LOAN_PERIOD = timedelta(days=14)
+
 class Library:
     def __init__(self):
         self._books = {}            # isbn -> Book
-        self._reservations = defaultdict(deque)  # isbn -> queue of user_ids
+        self._reservations = {}     # isbn -> queue of user_ids
+        self._bigram_index = {}     # title bigram -> set of isbns
+        self._available = {}        # isbn -> Book with copies on shelf
+        self._available_by_genre = {}  # genre -> {isbn: Book} with copies on shelf
+        self._version = 0           # bumped on every catalog/availability change
+        self._search_cache = {}     # (kind, term_lc) -> result for current version
+
+    # ----- query memoization -----
+    SEARCH_CACHE_SIZE = 256
+
+    def _touch(self):
+        self._version += 1
+        self._search_cache.clear()
+
+    def _cached(self, key, compute, *args):
+        """Return the memoized result for key, computing it on a miss.
+
+        Cached results are shared between callers and must not be mutated.
+        """
+        cache = self._search_cache
+        if key in cache:
+            return cache[key]
+        if len(cache) >= self.SEARCH_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        result = cache[key] = compute(*args)
+        return result
+
+    # ----- search indexes -----
+    def _index_book(self, book: Book):
+        for bigram in book._bigrams:
+            self._bigram_index.setdefault(bigram, set()).add(book.isbn)
+
+    def _unindex_book(self, book: Book):
+        for bigram in book._bigrams:
+            isbns = self._bigram_index[bigram]
+            isbns.discard(book.isbn)
+            if not isbns:
+                del self._bigram_index[bigram]
+
+    def _sync_availability(self, book: Book):
+        """Keep the shelf indexes and count label in step with book's copy counts."""
+        book.update_avail_total()
+        shelf = self._available_by_genre.get(book.genre)
+        if book.available_copies > 0 and book.isbn in self._books:
+            self._available[book.isbn] = book
+            if shelf is None:
+                shelf = self._available_by_genre[book.genre] = {}
+            shelf[book.isbn] = book
+        else:
+            self._available.pop(book.isbn, None)
+            if shelf is not None:
+                shelf.pop(book.isbn, None)
+                if not shelf:
+                    del self._available_by_genre[book.genre]
+
+    def _fuzzy_titles(self, title_lc: str, n: int = 5, cutoff: float = 0.6):
+        """Shortlist by bigram Jaccard, then rank only the top n with difflib."""
+        query = frozenset(zip(title_lc, title_lc[1:]))
+        candidates = set()
+        for bigram in query:
+            candidates |= self._bigram_index.get(bigram, set())
+        if not candidates:
+            return []
+        books = (self._books[isbn] for isbn in candidates)
+        shortlist = heapq.nlargest(
+            n, books, key=lambda b: len(query & b._bigrams) / len(query | b._bigrams))
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(title_lc)
+        scored = []
+        for b in shortlist:
+            matcher.set_seq1(b._title_lc)
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, b))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [b for _, b in scored]
 
     def add_book(self, book: Book, count: int = 1):
-        if book.isbn in self._books:
-            existing = self._books[book.isbn]
+        existing = self._books.get(book.isbn)
+        if existing is not None:
             existing.total_copies += count
             existing.available_copies += count
+            self._sync_availability(existing)
         else:
             book.total_copies = count
             book.available_copies = count
             self._books[book.isbn] = book
-        logging.info(f"ADD_BOOK: {book.title} x{count}")
+            self._index_book(book)
+            self._sync_availability(book)
+        self._touch()
+        logging.info("ADD_BOOK: %s x%d", book.title, count)
+
+    def bulk_add(self, books):
+        """Insert many books at once with a single cache bump and log record.
+
+        Each book keeps the copy counts it was constructed with.
+        """
+        added = 0
+        for book in books:
+            if book.isbn in self._books:
+                self.add_book(book, book.total_copies)
+                continue
+            self._books[book.isbn] = book
+            self._index_book(book)
+            self._sync_availability(book)
+            added += 1
+        self._touch()
+        logging.info("BULK_ADD: %d books", added)
 
     def remove_book(self, isbn: str, count: int = 1):
-        if isbn not in self._books:
+        book = self._books.get(isbn)
+        if book is None:
             raise BookNotFoundError("Book not found in library")
-        book = self._books[isbn]
         if count > book.available_copies:
             raise BookNotAvailableError("Cannot remove more copies than available")
         book.total_copies -= count
         book.available_copies -= count
         if book.total_copies <= 0:
             del self._books[isbn]
-        logging.info(f"REMOVE_BOOK: {isbn} x{count}")
-
-    def lend_book(self, isbn: str, user_id: str):
-        if isbn not in self._books:
+            self._unindex_book(book)
+        self._sync_availability(book)
+        self._touch()
+        logging.info("REMOVE_BOOK: %s x%d", isbn, count)
+
+    def lend_book(self, isbn: str, user_id: str, now: datetime = None):
+        book = self._books.get(isbn)
+        if book is None:
             raise BookNotFoundError("Book not found in library")
-        book = self._books[isbn]
-        if book.available_copies <= 0:
+        if not book.available_copies:
             raise BookNotAvailableError("Book currently not available")
         book.available_copies -= 1
-        due_date = datetime.now() + timedelta(days=14)
-        logging.info(f"LEND_BOOK: {isbn} to {user_id}, due {due_date.date()}")
+        self._sync_availability(book)
+        self._touch()
+        if now is None:
+            now = datetime.now()
+        due_date = now + LOAN_PERIOD
+        logging.info("LEND_BOOK: %s to %s, due %s", isbn, user_id, due_date.date())
         return due_date
 
     def return_book(self, isbn: str, user_obj, return_date: datetime = None):
-        if isbn not in self._books:
+        book = self._books.get(isbn)
+        if book is None:
             raise BookNotFoundError("Book not found in library")
-        book = self._books[isbn]
         book.available_copies += 1
+        self._sync_availability(book)
+        self._touch()
 
         if return_date:
             due = user_obj.borrowed_books.get(isbn)
@@ -119,63 +244,66 @@ class Library:
                 fine = days_late * 1  # $1 per day
                 print(f"You have a fine of ${fine} for late return.")
 
-        if self._reservations[isbn]:
-            next_user = self._reservations[isbn].popleft()
+        queue = self._reservations.get(isbn)
+        if queue:
+            next_user = queue.popleft()
+            if not queue:
+                del self._reservations[isbn]
             print(f"Notification: {next_user}, your reserved book '{book.title}' is now available.")
-            logging.info(f"RESERVATION_NOTIFY: {isbn} to {next_user}")
+            logging.info("RESERVATION_NOTIFY: %s to %s", isbn, next_user)
 
-        logging.info(f"RETURN_BOOK: {isbn} by {user_obj.user_id}")
+        logging.info("RETURN_BOOK: %s by %s", isbn, user_obj.user_id)
 
     def __iter__(self):
-        self._iter_list = [b for b in self._books.values() if b.available_copies > 0]
-        self._idx = 0
-        return self
-
-    def __next__(self):
-        if self._idx >= len(self._iter_list):
-            raise StopIteration
-        book = self._iter_list[self._idx]
-        self._idx += 1
-        return book
+        return iter(self._available.values())
 
     def books_by_author(self, author_name: str):
+        author_lc = author_name.lower()
         for book in self._books.values():
-            if book.author.lower() == author_name.lower():
+            if book._author_lc == author_lc:
                 yield book
 
     def search_by_title(self, title: str):
-        matches = [b for b in self._books.values() if title.lower() in b.title.lower()]
+        title_lc = title.lower()
+        return self._cached(("title", title_lc), self._search_by_title, title_lc)
+
+    def _search_by_title(self, title_lc: str):
+        # every substring match in catalog order; difflib only on a miss
+        matches = [b for b in self._books.values() if title_lc in b._title_lc]
         if matches:
             return matches
-        titles = [b.title for b in self._books.values()]
-        return difflib.get_close_matches(title, titles)
+        return self._fuzzy_titles(title_lc)
 
     def search_by_author(self, author: str):
-        return [b for b in self._books.values() if author.lower() in b.author.lower()]
+        author_lc = author.lower()
+        return self._cached(("author", author_lc), self._search_by_author, author_lc)
+
+    def _search_by_author(self, author_lc: str):
+        return [b for b in self._books.values() if author_lc in b._author_lc]
 
     def search_by_isbn(self, isbn: str):
         return self._books.get(isbn)
 
     def filter_by_genre(self):
-        genres = defaultdict(list)
-        for b in self._books.values():
-            if b.available_copies > 0:
-                genres[b.genre].append(b)
-        return genres
+        return self._cached(("genre", None), self._filter_by_genre)
+
+    def _filter_by_genre(self):
+        return {genre: list(shelf.values())
+                for genre, shelf in self._available_by_genre.items()}
 
     def reserve_book(self, isbn: str, user_id: str):
-        if isbn not in self._books:
+        book = self._books.get(isbn)
+        if book is None:
             raise BookNotFoundError("Book not found in library")
-        book = self._books[isbn]
         if book.available_copies > 0:
             raise ReservationError("Book is available; no need to reserve")
-        self._reservations[isbn].append(user_id)
-        logging.info(f"RESERVE_BOOK: {isbn} by {user_id}")
+        self._reservations.setdefault(isbn, deque()).append(user_id)
+        logging.info("RESERVE_BOOK: %s by %s", isbn, user_id)
 
 class DigitalLibrary(Library):
     def add_ebook(self, ebook: eBook):
         self.add_book(ebook, count=1)
-        logging.info(f"ADD_EBOOK: {ebook.title}")
+        logging.info("ADD_EBOOK: %s", ebook.title)
 
 # ========== User Management ==========
 default_borrow_limit = 5
@@ -184,12 +312,17 @@ class User:
     def __init__(self, user_id: str, name: str, password: str):
         self.user_id = user_id
         self.name = name
-        self._password = password
+        # only a salted digest is kept; the plaintext is never stored
+        self._salt = secrets.token_bytes(16)
+        self._pw_hash = self._hash_password(password)
         self.borrowed_books = {}    # isbn -> due_date
         self.reserved_books = set()
 
+    def _hash_password(self, password: str) -> bytes:
+        return hashlib.blake2b(password.encode(), salt=self._salt, digest_size=32).digest()
+
     def verify_password(self, password: str) -> bool:
-        return password == self._password
+        return hmac.compare_digest(self._pw_hash, self._hash_password(password))
 
 class LibrarySystem:
     def __init__(self):
@@ -200,6 +333,23 @@ class LibrarySystem:
         self.dlibrary = DigitalLibrary()
         self.users = {}
         self.current_user = None
+        # menu choice -> handler
+        self._auth_actions = {
+            '1': self._register_flow,
+            '2': self._login_flow,
+            '3': self.exit,
+        }
+        self._main_actions = {
+            '1': self.list_books,
+            '2': self.add_book,
+            '3': self.lend_book,
+            '4': self.return_book,
+            '5': self.search_books,
+            '6': self.reserve_book,
+            '7': self.filter_by_genre,
+            '8': self.logout,
+            '9': self.exit,
+        }
 
     def register_user(self, user_id, name, password):
         if user_id in self.users:
@@ -329,9 +479,19 @@ class LibrarySystem:
             ("Fahrenheit 451", "Ray Bradbury", "9781451673319", "Dystopian Fiction"),
             ("Brave New World", "Aldous Huxley", "9780060850524", "Dystopian Fiction"),
         ]
-        for title, author, isbn, genre in books_data:
-            b = Book(title, author, isbn, genre, total_copies=1)
-            self.library.add_book(b, count=1)
+        self.library.bulk_add(Book(title, author, isbn, genre, total_copies=1)
+                              for title, author, isbn, genre in books_data)
+
+    def _register_flow(self):
+        uid = input("   • User ID: ").strip()
+        name = input("   • Name: ").strip()
+        pw = input("   • Password: ").strip()
+        self.register_user(uid, name, pw)
+
+    def _login_flow(self):
+        uid = input("   • User ID: ").strip()
+        pw = input("   • Password: ").strip()
+        self.login(uid, pw)
 
     def manage_state(self):
         """Main state machine: show auth menu or main menu based on login state."""
@@ -339,40 +499,17 @@ class LibrarySystem:
             if not self.current_user:
                 display_auth_menu()
                 choice = input("👉 Choose an option: ").strip()
-                if choice == '1':
-                    uid = input("   • User ID: ").strip()
-                    name = input("   • Name: ").strip()
-                    pw = input("   • Password: ").strip()
-                    self.register_user(uid, name, pw)
-                elif choice == '2':
-                    uid = input("   • User ID: ").strip()
-                    pw = input("   • Password: ").strip()
-                    self.login(uid, pw)
-                elif choice == '3':
-                    self.exit()
+                handler = self._auth_actions.get(choice)
+                if handler:
+                    handler()
                 else:
                     print("❗ Invalid option, please enter 1, 2 or 3.")
             else:
                 display_main_menu(self.current_user.name)
                 action = input("👉 Select action [1–9]: ").strip()
-                if action == '1':
-                    self.list_books()
-                elif action == '2':
-                    self.add_book()
-                elif action == '3':
-                    self.lend_book()
-                elif action == '4':
-                    self.return_book()
-                elif action == '5':
-                    self.search_books()
-                elif action == '6':
-                    self.reserve_book()
-                elif action == '7':
-                    self.filter_by_genre()
-                elif action == '8':
-                    self.logout()
-                elif action == '9':
-                    self.exit()
+                handler = self._main_actions.get(action)
+                if handler:
+                    handler()
                 else:
                     print("❗ Invalid option, please enter a number from 1 to 9.")
 
@@ -1,43 +1,152 @@
 import sys
 from datetime import datetime
+from functools import partial
+from itertools import chain
+from operator import attrgetter
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QStackedWidget, QVBoxLayout,
-    QHBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox, QTableWidget,
-    QTableWidgetItem, QDialog, QSpinBox, QComboBox, QHeaderView
+    QHBoxLayout, QFormLayout, QLabel, QLineEdit, QPushButton, QMessageBox,
+    QTableView, QDialog, QSpinBox, QComboBox, QHeaderView
 )
 from PyQt5.QtGui import QFont, QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
 from backend import LibrarySystem, Book
 
-# Common styles for widgets
-def common_styles():
-    return {
-        'button': (
-            "QPushButton { background-color: #0066CC; color: white; border-radius: 6px; padding: 8px; }"
-            "QPushButton:hover { background-color: #005BB5; }"
-            "QPushButton:pressed { background-color: #004C99; }"
-        ),
-        'lineedit': (
-            "QLineEdit { border: 1px solid #ccc; border-radius: 4px; padding: 6px; }"
-            "QLineEdit:focus { border-color: #0066CC; }"
-        )
-    }
+# Common styles for widgets, applied once app-wide by LibraryApp; the
+# object-name selectors let Qt share one parsed rule set across instances
+_APP_QSS = (
+    "QPushButton#StyledButton { background-color: #0066CC; color: white; border-radius: 6px; padding: 8px; }"
+    "QPushButton#StyledButton:hover { background-color: #005BB5; }"
+    "QPushButton#StyledButton:pressed { background-color: #004C99; }"
+    "QLineEdit#StyledLineEdit { border: 1px solid #ccc; border-radius: 4px; padding: 6px; }"
+    "QLineEdit#StyledLineEdit:focus { border-color: #0066CC; }"
+)
 
 class StyledButton(QPushButton):
     def __init__(self, text, width=120):
         super().__init__(text)
+        self.setObjectName("StyledButton")
         self.setFixedWidth(width)
         self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet(common_styles()['button'])
 
 class StyledLineEdit(QLineEdit):
     def __init__(self, placeholder='', width=200, password=False):
         super().__init__()
+        self.setObjectName("StyledLineEdit")
         self.setFixedWidth(width)
         self.setPlaceholderText(placeholder)
         if password:
             self.setEchoMode(QLineEdit.Password)
-        self.setStyleSheet(common_styles()['lineedit'])
+
+# Table layouts: (header, cell formatter) per column; attrgetter reads the
+# Book slot without running a Python frame per painted cell
+BOOK_COLUMNS = (
+    ("Title", attrgetter("title")),
+    ("Author", attrgetter("author")),
+    ("ISBN", attrgetter("isbn")),
+    ("Genre", attrgetter("genre")),
+    ("Avail/Total", attrgetter("avail_total")),
+)
+GENRE_COLUMNS = (
+    ("Genre", attrgetter("genre")),
+    ("Title", attrgetter("title")),
+    ("Author", attrgetter("author")),
+    ("ISBN", attrgetter("isbn")),
+    ("Avail", lambda b: str(b.available_copies)),
+    ("Total", lambda b: str(b.total_copies)),
+)
+
+COLUMN_WIDTH = 150
+_CELL_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+# rows handed to the view at a time; the view asks for the next batch as it
+# scrolls near the end, so huge results never block the event loop at once
+FETCH_BATCH = 500
+
+class BookTableModel(QAbstractTableModel):
+    """Read-only model; cells are formatted only when the view paints them."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        # row count as announced to the view so far; rows past it are
+        # handed over in batches by fetchMore
+        self._count = 0
+        self._columns = BOOK_COLUMNS
+
+    def set_rows(self, rows, columns=BOOK_COLUMNS):
+        if columns is not self._columns:
+            self.beginResetModel()
+            self._rows = rows
+            self._count = min(len(rows), FETCH_BATCH)
+            self._columns = columns
+            self.endResetModel()
+            return
+        # same layout: keep the view's existing rows and only insert/remove
+        # the difference, then repaint the rows that were kept; rows beyond
+        # the first batch (or what was already scrolled in) come via fetchMore
+        old = self._count
+        new = min(len(rows), max(old, FETCH_BATCH))
+        if new > old:
+            self.beginInsertRows(QModelIndex(), old, new - 1)
+            self._rows, self._count = rows, new
+            self.endInsertRows()
+        elif new < old:
+            self.beginRemoveRows(QModelIndex(), new, old - 1)
+            self._rows, self._count = rows, new
+            self.endRemoveRows()
+        else:
+            self._rows = rows
+        kept = min(old, new)
+        if kept:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(kept - 1, len(columns) - 1))
+
+    def current(self):
+        """The rows and column layout last passed to set_rows."""
+        return self._rows, self._columns
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._count < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        more = min(len(self._rows) - self._count, FETCH_BATCH)
+        if more <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._count, self._count + more - 1)
+        self._count += more
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        return self._columns[index.column()][1](self._rows[index.row()])
+
+    def flags(self, index):
+        # constant and never editable, so the view skips edit-role lookups
+        return _CELL_FLAGS
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section][0]
+        return section + 1
+
+def _make_form(parent):
+    form = QFormLayout(parent)
+    form.setLabelAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    return form
+
+def _add_form_button(form, btn):
+    form.addRow(btn)
+    form.setAlignment(btn, Qt.AlignCenter)
 
 class LoginRegisterWidget(QWidget):
     def __init__(self, parent):
@@ -70,99 +179,41 @@ class LoginRegisterWidget(QWidget):
         self._create_register_form()
         main_layout.addWidget(self.stack)
 
-        self.login_tab.clicked.connect(lambda: self.stack.setCurrentIndex(0))
-        self.register_tab.clicked.connect(lambda: self.stack.setCurrentIndex(1))
+        self.login_tab.clicked.connect(partial(self.stack.setCurrentIndex, 0))
+        self.register_tab.clicked.connect(partial(self.stack.setCurrentIndex, 1))
 
     def _create_login_form(self):
         page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setAlignment(Qt.AlignCenter)
-        layout.setSpacing(20)
-
-        # User ID row
-        row1 = QHBoxLayout()
-        row1.addStretch()
-        lbl_id = QLabel("User ID:")
-        lbl_id.setFixedWidth(80)
-        lbl_id.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form = _make_form(page)
+        form.setFormAlignment(Qt.AlignCenter)
+        form.setVerticalSpacing(20)
+
         self.login_id = StyledLineEdit('Enter ID')
-        row1.addWidget(lbl_id)
-        row1.addWidget(self.login_id)
-        row1.addStretch()
-        layout.addLayout(row1)
-
-        # Password row
-        row2 = QHBoxLayout()
-        row2.addStretch()
-        lbl_pw = QLabel("Password:")
-        lbl_pw.setFixedWidth(80)
-        lbl_pw.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form.addRow("User ID:", self.login_id)
         self.login_pw = StyledLineEdit('Enter Password', password=True)
-        row2.addWidget(lbl_pw)
-        row2.addWidget(self.login_pw)
-        row2.addStretch()
-        layout.addLayout(row2)
+        form.addRow("Password:", self.login_pw)
 
-        # Button row
         btn = StyledButton("Login", 120)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        layout.addLayout(btn_row)
+        _add_form_button(form, btn)
         btn.clicked.connect(self._handle_login)
 
         self.stack.addWidget(page)
 
     def _create_register_form(self):
         page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setAlignment(Qt.AlignCenter)
-        layout.setSpacing(20)
-
-        # User ID row
-        row1 = QHBoxLayout()
-        row1.addStretch()
-        lbl_id = QLabel("User ID:")
-        lbl_id.setFixedWidth(80)
-        lbl_id.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form = _make_form(page)
+        form.setFormAlignment(Qt.AlignCenter)
+        form.setVerticalSpacing(20)
+
         self.reg_id = StyledLineEdit('New ID')
-        row1.addWidget(lbl_id)
-        row1.addWidget(self.reg_id)
-        row1.addStretch()
-        layout.addLayout(row1)
-
-        # Name row
-        row2 = QHBoxLayout()
-        row2.addStretch()
-        lbl_name = QLabel("Name:")
-        lbl_name.setFixedWidth(80)
-        lbl_name.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form.addRow("User ID:", self.reg_id)
         self.reg_name = StyledLineEdit('Full Name')
-        row2.addWidget(lbl_name)
-        row2.addWidget(self.reg_name)
-        row2.addStretch()
-        layout.addLayout(row2)
-
-        # Password row
-        row3 = QHBoxLayout()
-        row3.addStretch()
-        lbl_pw = QLabel("Password:")
-        lbl_pw.setFixedWidth(80)
-        lbl_pw.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form.addRow("Name:", self.reg_name)
         self.reg_pw = StyledLineEdit('New Password', password=True)
-        row3.addWidget(lbl_pw)
-        row3.addWidget(self.reg_pw)
-        row3.addStretch()
-        layout.addLayout(row3)
+        form.addRow("Password:", self.reg_pw)
 
-        # Button row
         btn = StyledButton("Register", 120)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        layout.addLayout(btn_row)
+        _add_form_button(form, btn)
         btn.clicked.connect(self._handle_register)
 
         self.stack.addWidget(page)
@@ -181,10 +232,29 @@ class LoginRegisterWidget(QWidget):
                                 f"User '{self.reg_name.text()}' registered.")
         self.stack.setCurrentIndex(0)
 
+# Main toolbar: (button label, MainWidget method name)
+_ACTIONS = (
+    ("List Books", "list_books"),
+    ("Add Book", "add_book_dialog"),
+    ("Lend Book", "lend_book_dialog"),
+    ("Return Book", "return_book_dialog"),
+    ("Search Books", "search_books_dialog"),
+    ("Reserve Book", "reserve_book_dialog"),
+    ("Filter Genre", "filter_genre"),
+    ("Logout", "logout"),
+)
+
 class MainWidget(QWidget):
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
+        self._dialogs = {}  # name -> (dialog, fields reset on reopen)
+        # coalesces search-term keystrokes into one query after typing pauses
+        self._search_timer = QTimer(self, singleShot=True, interval=200)
+        # key of the view currently shown (listing or search, with the
+        # library version); None for the genre view
+        self._last_rendered = None
+        self._before_search = None  # (rows, columns, view) when search opened
         layout = QVBoxLayout(self)
 
         # User label
@@ -195,25 +265,22 @@ class MainWidget(QWidget):
         # Action buttons
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(8)
-        actions = {
-            "List Books": self.list_books,
-            "Add Book": self.add_book_dialog,
-            "Lend Book": self.lend_book_dialog,
-            "Return Book": self.return_book_dialog,
-            "Search Books": self.search_books_dialog,
-            "Reserve Book": self.reserve_book_dialog,
-            "Filter Genre": self.filter_genre,
-            "Logout": self.parent.logout
-        }
-        for name, func in actions.items():
+        for name, attr in _ACTIONS:
             btn = StyledButton(name, width=110)
-            btn.clicked.connect(func)
+            btn.clicked.connect(getattr(self, attr))
             btn_layout.addWidget(btn)
         layout.addLayout(btn_layout)
 
         # Table view
-        self.table = QTableWidget()
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = BookTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(False)
+        # constant column widths: header sizing never looks at cell contents
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setDefaultSectionSize(COLUMN_WIDTH)
+        header.setStretchLastSection(True)
         layout.addWidget(self.table)
 
     def refresh_user(self):
@@ -221,59 +288,59 @@ class MainWidget(QWidget):
         self.lbl_user.setText(f"👤 Logged in as: {user.name}")
         self.list_books()
 
+    def logout(self):
+        self.parent.logout()
+
     def list_books(self):
-        books = list(self.parent.system.library._books.values())
-        self._populate_table(books)
+        library = self.parent.system.library
+        view = ('all', library._version)
+        if self._last_rendered == view:
+            return
+        # a snapshot, so rows and the model's announced count stay in step
+        self._populate_table(list(library._books.values()), view)
+
+    def _exec_dialog(self, key, build):
+        """Build a dialog on first use, then reopen it with its fields reset."""
+        entry = self._dialogs.get(key)
+        if entry is None:
+            entry = self._dialogs[key] = build()
+        dlg, fields = entry
+        for field in fields:
+            if isinstance(field, QSpinBox):
+                field.setValue(field.minimum())
+            else:
+                field.clear()
+        dlg.exec_()
 
     def add_book_dialog(self):
+        self._exec_dialog('add_book', self._build_add_book_dialog)
+
+    def _build_add_book_dialog(self):
         dlg = QDialog(self)
         dlg.setWindowTitle("Add New Book")
-        form = QVBoxLayout(dlg)
+        form = _make_form(dlg)
 
-        # Reuse centered rows
-        for label_text, widget in [
-            ("Title:", StyledLineEdit('Title')),
-            ("Author:", StyledLineEdit('Author')),
-            ("ISBN:", StyledLineEdit('ISBN')),
-            ("Genre:", StyledLineEdit('Genre'))
-        ]:
-            row = QHBoxLayout()
-            row.addStretch()
-            lbl = QLabel(label_text)
-            lbl.setFixedWidth(80)
-            lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            row.addWidget(lbl)
-            row.addWidget(widget)
-            row.addStretch()
-            form.addLayout(row)
-            if label_text == "Title:": title = widget
-            if label_text == "Author:": author = widget
-            if label_text == "ISBN:": isbn = widget
-            if label_text == "Genre:": genre = widget
-
-        # Copies spinner
-        count_row = QHBoxLayout()
-        count_row.addStretch()
-        lbl_count = QLabel("Copies:")
-        lbl_count.setFixedWidth(80)
-        lbl_count.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        title = StyledLineEdit('Title')
+        author = StyledLineEdit('Author')
+        isbn = StyledLineEdit('ISBN')
+        genre = StyledLineEdit('Genre')
         count = QSpinBox()
         count.setMinimum(1)
-        count_row.addWidget(lbl_count)
-        count_row.addWidget(count)
-        count_row.addStretch()
-        form.addLayout(count_row)
+        for label_text, widget in [
+            ("Title:", title),
+            ("Author:", author),
+            ("ISBN:", isbn),
+            ("Genre:", genre),
+            ("Copies:", count)
+        ]:
+            form.addRow(label_text, widget)
 
         # Add button
         btn = StyledButton("Add", width=100)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        form.addLayout(btn_row)
-        btn.clicked.connect(lambda: self._add_book(title, author, isbn, genre, count, dlg))
+        _add_form_button(form, btn)
+        btn.clicked.connect(partial(self._add_book, title, author, isbn, genre, count, dlg))
 
-        dlg.exec_()
+        return dlg, (title, author, isbn, genre, count)
 
     def _add_book(self, title, author, isbn, genre, count, dlg):
         self.parent.system.library.add_book(
@@ -285,32 +352,22 @@ class MainWidget(QWidget):
         self.list_books()
 
     def lend_book_dialog(self):
+        self._exec_dialog('lend_book', self._build_lend_book_dialog)
+
+    def _build_lend_book_dialog(self):
         dlg = QDialog(self)
         dlg.setWindowTitle("Lend Book")
-        form = QVBoxLayout(dlg)
-
-        # ISBN row
-        row = QHBoxLayout()
-        row.addStretch()
-        lbl = QLabel("ISBN:")
-        lbl.setFixedWidth(80)
-        lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form = _make_form(dlg)
+
         isbn = StyledLineEdit('ISBN')
-        row.addWidget(lbl)
-        row.addWidget(isbn)
-        row.addStretch()
-        form.addLayout(row)
+        form.addRow("ISBN:", isbn)
 
         # Lend button
         btn = StyledButton("Lend", width=100)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        form.addLayout(btn_row)
-        btn.clicked.connect(lambda: self._lend_book(isbn, dlg))
+        _add_form_button(form, btn)
+        btn.clicked.connect(partial(self._lend_book, isbn, dlg))
 
-        dlg.exec_()
+        return dlg, (isbn,)
 
     def _lend_book(self, isbn_field, dlg):
         try:
@@ -325,32 +382,22 @@ class MainWidget(QWidget):
             QMessageBox.warning(self, "Error", str(e))
 
     def return_book_dialog(self):
+        self._exec_dialog('return_book', self._build_return_book_dialog)
+
+    def _build_return_book_dialog(self):
         dlg = QDialog(self)
         dlg.setWindowTitle("Return Book")
-        form = QVBoxLayout(dlg)
-
-        # ISBN row
-        row = QHBoxLayout()
-        row.addStretch()
-        lbl = QLabel("ISBN:")
-        lbl.setFixedWidth(80)
-        lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form = _make_form(dlg)
+
         isbn = StyledLineEdit('ISBN')
-        row.addWidget(lbl)
-        row.addWidget(isbn)
-        row.addStretch()
-        form.addLayout(row)
+        form.addRow("ISBN:", isbn)
 
         # Return button
         btn = StyledButton("Return", width=100)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        form.addLayout(btn_row)
-        btn.clicked.connect(lambda: self._return_book(isbn, dlg))
+        _add_form_button(form, btn)
+        btn.clicked.connect(partial(self._return_book, isbn, dlg))
 
-        dlg.exec_()
+        return dlg, (isbn,)
 
     def _return_book(self, isbn_field, dlg):
         try:
@@ -365,84 +412,85 @@ class MainWidget(QWidget):
             QMessageBox.warning(self, "Error", str(e))
 
     def search_books_dialog(self):
+        # live results are only a preview; cancelling puts this view back
+        self._before_search = self.model.current() + (self._last_rendered,)
+        self._exec_dialog('search_books', self._build_search_books_dialog)
+
+    def _build_search_books_dialog(self):
         dlg = QDialog(self)
         dlg.setWindowTitle("Search Books")
-        form = QVBoxLayout(dlg)
-
-        # Search by row
-        row1 = QHBoxLayout()
-        row1.addStretch()
-        lbl_by = QLabel("By:")
-        lbl_by.setFixedWidth(80)
-        lbl_by.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form = _make_form(dlg)
+
         combo = QComboBox()
         combo.addItems(["title", "author", "isbn"])
-        row1.addWidget(lbl_by)
-        row1.addWidget(combo)
-        row1.addStretch()
-        form.addLayout(row1)
-
-        # Term row
-        row2 = QHBoxLayout()
-        row2.addStretch()
-        lbl_term = QLabel("Term:")
-        lbl_term.setFixedWidth(80)
-        lbl_term.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form.addRow("By:", combo)
         term = StyledLineEdit('Search term')
-        row2.addWidget(lbl_term)
-        row2.addWidget(term)
-        row2.addStretch()
-        form.addLayout(row2)
+        form.addRow("Term:", term)
 
         # Search button
         btn = StyledButton("Search", width=100)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        form.addLayout(btn_row)
-        btn.clicked.connect(lambda: self._search(combo.currentText(), term.text(), dlg))
+        _add_form_button(form, btn)
+        btn.clicked.connect(partial(self._search, combo, term, dlg))
 
-        dlg.exec_()
+        # Live results once typing pauses
+        term.textChanged.connect(self._schedule_search)
+        combo.currentIndexChanged.connect(self._schedule_search)
+        self._search_timer.timeout.connect(partial(self._live_search, combo, term))
+        dlg.rejected.connect(self._cancel_search)
+
+        return dlg, (term,)
 
-    def _search(self, by, term, dlg):
+    def _find(self, by, term):
         if by == 'title':
-            results = self.parent.system.library.search_by_title(term)
-        elif by == 'author':
-            results = self.parent.system.library.search_by_author(term)
-        else:
-            book = self.parent.system.library.search_by_isbn(term)
-            results = [book] if book else []
+            return self.parent.system.library.search_by_title(term)
+        if by == 'author':
+            return self.parent.system.library.search_by_author(term)
+        book = self.parent.system.library.search_by_isbn(term)
+        return [book] if book else []
+
+    def _schedule_search(self, *_):
+        self._search_timer.start()
+
+    def _show_search(self, by, term):
+        # the live search usually already rendered this exact query
+        view = ('search', by, term, self.parent.system.library._version)
+        if self._last_rendered == view:
+            return
+        self._populate_table(self._find(by, term), view)
+
+    def _live_search(self, by_combo, term_field):
+        term = term_field.text().strip()
+        if term:
+            self._show_search(by_combo.currentText(), term)
+
+    def _cancel_search(self):
+        self._search_timer.stop()
+        rows, columns, view = self._before_search
+        if self._last_rendered != view:
+            self._show_rows(rows, columns, view)
+
+    def _search(self, by_combo, term_field, dlg):
+        self._search_timer.stop()
         dlg.accept()
-        self._populate_table(results)
+        self._show_search(by_combo.currentText(), term_field.text().strip())
 
     def reserve_book_dialog(self):
+        self._exec_dialog('reserve_book', self._build_reserve_book_dialog)
+
+    def _build_reserve_book_dialog(self):
         dlg = QDialog(self)
         dlg.setWindowTitle("Reserve Book")
-        form = QVBoxLayout(dlg)
-
-        # ISBN row
-        row = QHBoxLayout()
-        row.addStretch()
-        lbl = QLabel("ISBN:")
-        lbl.setFixedWidth(80)
-        lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        form = _make_form(dlg)
+
         isbn = StyledLineEdit('ISBN')
-        row.addWidget(lbl)
-        row.addWidget(isbn)
-        row.addStretch()
-        form.addLayout(row)
+        form.addRow("ISBN:", isbn)
 
         # Reserve button
         btn = StyledButton("Reserve", width=100)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        btn_row.addWidget(btn)
-        btn_row.addStretch()
-        form.addLayout(btn_row)
-        btn.clicked.connect(lambda: self._reserve(isbn, dlg))
+        _add_form_button(form, btn)
+        btn.clicked.connect(partial(self._reserve, isbn, dlg))
 
-        dlg.exec_()
+        return dlg, (isbn,)
 
     def _reserve(self, isbn_field, dlg):
         try:
@@ -456,38 +504,29 @@ class MainWidget(QWidget):
             QMessageBox.warning(self, "Error", str(e))
 
     def filter_genre(self):
+        # the library keeps a per-genre index of books on the shelf, so this
+        # is a copy of small lists and cheap enough for the GUI thread; books
+        # are grouped under their own genre, so rows are just books
         genres = self.parent.system.library.filter_by_genre()
-        items = []
-        for g, books in genres.items():
-            for b in books:
-                items.append((g, b.title, b.author, b.isbn,
-                              str(b.available_copies), str(b.total_copies)))
-        self.table.clear()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(
-            ["Genre", "Title", "Author", "ISBN", "Avail", "Total"])
-        self.table.setRowCount(len(items))
-        for r, row in enumerate(items):
-            for c, val in enumerate(row):
-                self.table.setItem(r, c, QTableWidgetItem(val))
-
-    def _populate_table(self, book_list):
-        self.table.clear()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(
-            ["Title", "Author", "ISBN", "Genre", "Avail/Total"])
-        self.table.setRowCount(len(book_list))
-        for r, b in enumerate(book_list):
-            self.table.setItem(r, 0, QTableWidgetItem(b.title))
-            self.table.setItem(r, 1, QTableWidgetItem(b.author))
-            self.table.setItem(r, 2, QTableWidgetItem(b.isbn))
-            self.table.setItem(r, 3, QTableWidgetItem(b.genre))
-            self.table.setItem(r, 4, QTableWidgetItem(
-                f"{b.available_copies}/{b.total_copies}"))
+        self._show_rows(list(chain.from_iterable(genres.values())), GENRE_COLUMNS)
+
+    def _populate_table(self, book_list, view=None):
+        self._show_rows(book_list, BOOK_COLUMNS, view)
+
+    def _show_rows(self, rows, columns, view=None):
+        # repaint once after the swap rather than on every model signal
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.model.set_rows(rows, columns)
+        finally:
+            self.table.setUpdatesEnabled(True)
+        self.table.viewport().update()
+        self._last_rendered = view
 
 class LibraryApp(QMainWindow):
     def __init__(self):
         super().__init__()
+        QApplication.instance().setStyleSheet(_APP_QSS)
         self.system = LibrarySystem()
         self.system.seed_library()
         self.setWindowTitle("Library Management System")
@@ -496,12 +535,14 @@ class LibraryApp(QMainWindow):
 
         self.stack = QStackedWidget()
         self.login_widget = LoginRegisterWidget(self)
-        self.main_widget = MainWidget(self)
+        self.main_widget = None  # built on first successful login
         self.stack.addWidget(self.login_widget)
-        self.stack.addWidget(self.main_widget)
         self.setCentralWidget(self.stack)
 
     def show_main(self):
+        if self.main_widget is None:
+            self.main_widget = MainWidget(self)
+            self.stack.addWidget(self.main_widget)
         self.main_widget.refresh_user()
         self.stack.setCurrentWidget(self.main_widget)
 